@@ -1,15 +1,25 @@
 from __future__ import annotations
+import base64
+import binascii
+import hashlib
+import hmac
+import re
+import threading
+import time
 from typing import Optional, Union
 from datetime import datetime, timedelta
 
+from cachetools import LRUCache, TLRUCache, TTLCache
+
 from fastapi import Depends, HTTPException, status, APIRouter
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm, HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy import select, func
+from sqlalchemy import select, func, bindparam, lambda_stmt
 from sqlalchemy.orm import Session
 
-from .db import get_db, SessionLocal
+from .db import get_db
 from .models import UserORM
 from .schemas import User, UserInDB, Token, RegisterRequest
 
@@ -17,30 +27,111 @@ from .schemas import User, UserInDB, Token, RegisterRequest
 SECRET_KEY = "dev-secret-change-me"  # replace in production or use env var
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Remember successful password checks in memory (single-tenant/benchmark setups
+# only: anyone able to read process memory learns which password fits a hash)
+PASSWORD_VERIFY_CACHE = False
 
-# Use pbkdf2_sha256 to avoid bcrypt backend issues on some platforms
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# argon2id (argon2-cffi) for new hashes; pbkdf2_sha256 is kept for verifying
+# existing hashes only and gets rehashed to argon2 on the next successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "pbkdf2_sha256"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 
-# Multiple authentication schemes
+# Both documented schemes (OAuth2 password flow and plain HTTP Bearer, see
+# main.custom_openapi) send the same `Authorization: Bearer <token>` header,
+# so a single security dependency extracts the token for either of them
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
-http_bearer = HTTPBearer(auto_error=False)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+_WHITESPACE_RE = re.compile(r"\s")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# User lookups run on every login/registration/cache miss; lambda_stmt caches
+# the statement and its compiled SQL, only the bound values change per call
+_USER_BY_USERNAME = lambda_stmt(lambda: select(UserORM).where(UserORM.username == bindparam("username")))
+_USER_ID_BY_USERNAME_CI = lambda_stmt(
+    lambda: select(UserORM.id).where(func.lower(UserORM.username) == bindparam("username_lower"))
+)
+
+# Verified tokens: raw token -> (username, exp). Entries expire together with the
+# token itself, so a cached hit is never served past the JWT's own `exp` claim.
+_token_cache: TLRUCache = TLRUCache(
+    maxsize=4096,
+    ttu=lambda _token, value, now: min(value[1], now + ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+    timer=time.time,
+)
+_token_cache_lock = threading.Lock()
+
+# Successful password checks: sha256(password + hash) digests, see PASSWORD_VERIFY_CACHE
+_verified_passwords: LRUCache = LRUCache(maxsize=1024)
+_verified_passwords_lock = threading.Lock()
+
+# Resolved users: username -> User, so hot requests skip the DB entirely
+_user_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+_user_cache_lock = threading.Lock()
+
+
+_PBKDF2_SHA256_PREFIX = "$pbkdf2-sha256$"
+
+
+def _ab64_decode(data: str) -> bytes:
+    # passlib's "adapted base64": '.' instead of '+', no padding
+    data = data.replace(".", "+")
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _verify_pbkdf2_sha256(plain_password: str, hashed_password: str) -> bool:
+    """Verify a passlib pbkdf2_sha256 hash with OpenSSL's PBKDF2 via hashlib"""
+    try:
+        rounds, salt, checksum = hashed_password[len(_PBKDF2_SHA256_PREFIX):].split("$")
+        expected = _ab64_decode(checksum)
+        derived = hashlib.pbkdf2_hmac(
+            "sha256", plain_password.encode("utf-8"), _ab64_decode(salt), int(rounds), dklen=len(expected)
+        )
+    except (ValueError, binascii.Error):
+        return False
+    return hmac.compare_digest(derived, expected)
+
+
+def _verify_password_uncached(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith(_PBKDF2_SHA256_PREFIX):
+        return _verify_pbkdf2_sha256(plain_password, hashed_password)
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if not PASSWORD_VERIFY_CACHE:
+        return _verify_password_uncached(plain_password, hashed_password)
+
+    key = hashlib.sha256(plain_password.encode("utf-8") + b"\0" + hashed_password.encode("utf-8")).digest()
+    with _verified_passwords_lock:
+        if key in _verified_passwords:
+            return True
+    valid = _verify_password_uncached(plain_password, hashed_password)
+    # Only positive results are cached; failures are always re-checked
+    if valid:
+        with _verified_passwords_lock:
+            _verified_passwords[key] = True
+    return valid
+
+
+def authenticate_user(db: Session, username: str, password: str) -> Optional[UserInDB]:
     # Fetch from DB
-    with SessionLocal() as db:
-        user = db.execute(select(UserORM).where(UserORM.username == username)).scalar_one_or_none()
-        if not user:
-            return None
-        if not verify_password(password, user.hashed_password):
-            return None
-        return UserInDB(username=user.username, is_admin=user.is_admin, hashed_password=user.hashed_password)
+    user = db.execute(_USER_BY_USERNAME, {"username": username}).scalar_one_or_none()
+    if not user:
+        return None
+    if not verify_password(password, user.hashed_password):
+        return None
+    if pwd_context.needs_update(user.hashed_password):
+        # Migrate legacy hashes lazily
+        user.hashed_password = pwd_context.hash(password)
+        db.commit()
+    return UserInDB(username=user.username, is_admin=user.is_admin, hashed_password=user.hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -53,43 +144,63 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def verify_token(token: str) -> Optional[str]:
     """Verify JWT token and return username if valid"""
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        return cached[0]
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str | None = payload.get("sub")
-        return username
     except JWTError:
         return None
+    username: str | None = payload.get("sub")
+    exp = payload.get("exp")
+    # Only successful validations are cached
+    if username and isinstance(exp, (int, float)):
+        with _token_cache_lock:
+            _token_cache[token] = (username, exp)
+    return username
+
+
+def invalidate_cached_user(username: str) -> None:
+    """Drop a user from the lookup cache (e.g. after the account is deleted)"""
+    with _user_cache_lock:
+        _user_cache.pop(username, None)
+
+
+def _load_user(db: Session, username: str) -> Optional[User]:
+    user_in_db = db.execute(_USER_BY_USERNAME, {"username": username}).scalar_one_or_none()
+    if user_in_db is None:
+        return None
+    return User(id=user_in_db.id, username=user_in_db.username, is_admin=user_in_db.is_admin)
 
 
 async def get_current_user(
-    oauth2_token: Optional[str] = Depends(oauth2_scheme),
-    http_auth: Optional[HTTPAuthorizationCredentials] = Depends(http_bearer)
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    # Try OAuth2 token first, then HTTP Bearer
-    token = None
-    if oauth2_token:
-        token = oauth2_token
-    elif http_auth:
-        token = http_auth.credentials
-    
+
     if not token:
         raise credentials_exception
     
     username = verify_token(token)
     if not username:
         raise credentials_exception
-        
-    with SessionLocal() as db:
-        user_in_db = db.execute(select(UserORM).where(UserORM.username == username)).scalar_one_or_none()
-        if user_in_db is None:
+
+    with _user_cache_lock:
+        user = _user_cache.get(username)
+    if user is None:
+        user = await run_in_threadpool(_load_user, db, username)
+        if user is None:
             raise credentials_exception
-        return User(username=user_in_db.username, is_admin=user_in_db.is_admin)
+        with _user_cache_lock:
+            _user_cache[username] = user
+    return user
 
 
 async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
@@ -144,8 +255,9 @@ Authenticate a user and receive a JWT access token for subsequent requests.
         }
     }
 )
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = authenticate_user(form_data.username, form_data.password)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # Password hashing is CPU-bound; run it off the event loop
+    user = await run_in_threadpool(authenticate_user, db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
     access_token = create_access_token(data={"sub": user.username})
@@ -215,19 +327,18 @@ async def register_user(payload: RegisterRequest, db: Session = Depends(get_db))
     # Basic validation
     if len(username) < 3 or len(username) > 32:
         raise HTTPException(status_code=422, detail="Username must be 3-32 characters")
-    if any(ch.isspace() for ch in username):
+    if _WHITESPACE_RE.search(username):
         raise HTTPException(status_code=422, detail="Username must not contain whitespace")
     if len(password) < 6 or len(password) > 128:
         raise HTTPException(status_code=422, detail="Password must be 6-128 characters")
 
     # Ensure unique username (case-insensitive)
-    existing = db.execute(
-        select(UserORM).where(func.lower(UserORM.username) == username.lower())
-    ).scalar_one_or_none()
+    existing = db.execute(_USER_ID_BY_USERNAME_CI, {"username_lower": username.lower()}).first()
     if existing:
         raise HTTPException(status_code=409, detail="Username already taken")
 
-    user = UserORM(username=username, hashed_password=pwd_context.hash(password), is_admin=False)
+    hashed_password = await run_in_threadpool(pwd_context.hash, password)
+    user = UserORM(username=username, hashed_password=hashed_password, is_admin=False)
     db.add(user)
     db.commit()
     # No auto-login; return a simple confirmation
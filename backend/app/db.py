@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 # Resolve SQLite DB path next to this app package
@@ -9,9 +9,25 @@ _DB_PATH = _BASE_DIR / "app.db"
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{_DB_PATH}"
 
 # check_same_thread=False is required for SQLite to allow usage across threads
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False, "timeout": 30.0},
+    pool_pre_ping=False,
+)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside a writer; NORMAL syncs once per checkpoint
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=134217728")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 class Base(DeclarativeBase):
     pass
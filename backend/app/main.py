@@ -1,27 +1,45 @@
 from __future__ import annotations
+import hashlib
+import re
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pathlib import Path
 from fastapi.staticfiles import StaticFiles
-from starlette.responses import FileResponse
+from starlette.responses import Response
 from fastapi import HTTPException
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete, inspect
+from sqlalchemy.schema import CreateIndex
 from .db import engine, Base, SessionLocal
-from .models import UserORM, GearItemORM
+from .models import UserORM, GearItemORM, CartItemORM
 
 # Import routers and config
 from .docs import API_METADATA, OPENAPI_TAGS
-from .auth import router as auth_router, pwd_context
+from .auth import router as auth_router
+from .seed_hashes import SEED_USERS
 from .routes.catalog import router as catalog_router
 from .routes.cart import router as cart_router
 from .routes.admin import router as admin_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Seeding is blocking DB work; keep it off the event loop
+    await run_in_threadpool(_seed_db)
+    # Preheat the connection pool so the first request doesn't pay for connect
+    engine.connect().close()
+    yield
+
+
 # Create FastAPI app with metadata and custom security schemes
 app = FastAPI(
     **API_METADATA,
     openapi_tags=OPENAPI_TAGS,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     swagger_ui_parameters={
         "persistAuthorization": True,
         "displayRequestDuration": True,
@@ -96,39 +114,45 @@ app.include_router(admin_router)
 
 
 # --- DB init & seed ---
-@app.on_event("startup")
-def on_startup():
+def _merge_duplicate_cart_items(conn) -> None:
+    """Fold repeated (user_id, gear_item_id) cart rows into the lowest id, summing quantity.
+
+    Databases created before the unique `ux_cart_items_user_gear` index can hold such
+    rows, and the index cannot be created until they are gone.
+    """
+    t = CartItemORM.__table__
+    same = t.alias()
+    keep = t.alias()
+    group_qty = (
+        select(func.sum(same.c.quantity))
+        .where(same.c.user_id == t.c.user_id, same.c.gear_item_id == t.c.gear_item_id)
+        .scalar_subquery()
+    )
+    first_ids = select(func.min(keep.c.id)).group_by(keep.c.user_id, keep.c.gear_item_id)
+    conn.execute(update(t).where(t.c.id.in_(first_ids.having(func.count() > 1))).values(quantity=group_qty))
+    conn.execute(delete(t).where(t.c.id.not_in(first_ids)))
+
+
+def _seed_db():
     # Create tables
     Base.metadata.create_all(bind=engine)
+    # create_all skips indexes added to already existing tables
+    with engine.begin() as conn:
+        cart_indexes = {ix["name"] for ix in inspect(conn).get_indexes(CartItemORM.__tablename__)}
+        if "ux_cart_items_user_gear" not in cart_indexes:
+            _merge_duplicate_cart_items(conn)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
     # Seed admin user and demo items if DB is empty
     db = SessionLocal()
     try:
-        # admin user
-        admin = db.execute(select(UserORM).where(UserORM.username == "admin")).scalar_one_or_none()
-        if not admin:
-            db.add(UserORM(username="admin", hashed_password=pwd_context.hash("admin"), is_admin=True))
-            db.commit()
-        
-        # Seed test users if they don't exist
-        test_users = [
-            {"username": "user1", "password": "password1", "is_admin": False},
-            {"username": "user2", "password": "password2", "is_admin": False},
-            {"username": "testuser", "password": "test123", "is_admin": False},
-            {"username": "jankowalski", "password": "kowalski123", "is_admin": False},
-            {"username": "annanowak", "password": "nowak456", "is_admin": False},
-            {"username": "testadmin", "password": "admin123", "is_admin": True},
-        ]
-        
-        for user_data in test_users:
-            existing = db.execute(select(UserORM).where(UserORM.username == user_data["username"])).scalar_one_or_none()
-            if not existing:
-                db.add(UserORM(
-                    username=user_data["username"],
-                    hashed_password=pwd_context.hash(user_data["password"]),
-                    is_admin=user_data["is_admin"]
-                ))
-        db.commit()
-        
+        # Seed admin and test users if they don't exist (passwords are pre-hashed)
+        existing = set(db.execute(
+            select(UserORM.username).where(UserORM.username.in_([u["username"] for u in SEED_USERS]))
+        ).scalars())
+        db.add_all([UserORM(**u) for u in SEED_USERS if u["username"] not in existing])
+
         # seed items if none
         items_count = db.execute(select(func.count(GearItemORM.id))).scalar_one()
         if not items_count:
@@ -149,11 +173,17 @@ def on_startup():
                 {"name": "Sony MDR-7506", "category": "headphones", "brand": "Sony", "price": 449.0, "rating": 4.7, "description": "Klasyczne zamknięte słuchawki monitorowe"},
             ]
             db.add_all([GearItemORM(**it) for it in initial_items])
-            db.commit()
+        db.commit()
     finally:
         db.close()
 
 
+# Static bodies are encoded once; a fresh Response is still built per request
+# because middleware (CORS) appends to the response's header list in place
+_ROOT_BODY = b'{"message":"Audio Gear Catalog API. Go to /docs or /api/health"}'
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
 @app.get(
     "/api",
     tags=["General"],
@@ -162,7 +192,7 @@ def on_startup():
     response_description="API welcome message with navigation hints",
 )
 def root():
-    return {"message": "Audio Gear Catalog API. Go to /docs or /api/health"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get(
@@ -183,29 +213,41 @@ def root():
     }
 )
 def health():
-    return {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # --- SPA static frontend ---
 # Serve built frontend (Vite `frontend/dist`) with history API fallback
 _dist_dir = Path(__file__).resolve().parents[2] / "frontend" / "dist"
+# API, auth and docs/openapi paths that the SPA fallback must not shadow
+_BLOCKED_SPA_PATHS_RE = re.compile(r"^(?:api|auth|docs|redoc|openapi\.json|static|favicon\.ico)(?:/|$)")
 if (_dist_dir.exists()):
     # Serve built assets under /assets (as Vite outputs)
     assets_dir = _dist_dir / "assets"
     if assets_dir.exists():
         app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
 
+    # The SPA shell is tiny and only changes on rebuild: read it once
+    _index_path = _dist_dir / "index.html"
+    _INDEX_BYTES = _index_path.read_bytes() if _index_path.exists() else None
+    _INDEX_ETAG = f'"{hashlib.md5(_INDEX_BYTES).hexdigest()}"' if _INDEX_BYTES is not None else None
+
+    def _index_response(request: Request) -> Response:
+        if _INDEX_BYTES is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        headers = {"ETag": _INDEX_ETAG, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _INDEX_ETAG in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        return Response(content=_INDEX_BYTES, media_type="text/html", headers=headers)
+
     @app.get("/", include_in_schema=False)
-    async def serve_index():
-        return FileResponse(str(_dist_dir / "index.html"))
+    async def serve_index(request: Request):
+        return _index_response(request)
 
     @app.get("/{full_path:path}", include_in_schema=False)
-    async def serve_spa(full_path: str):
+    async def serve_spa(full_path: str, request: Request):
         # Do not override API, auth and docs/openapi routes
-        blocked_prefixes = ("api", "auth", "docs", "redoc", "openapi.json", "static", "favicon.ico")
-        if any(full_path == p or full_path.startswith(p + "/") for p in blocked_prefixes):
+        if _BLOCKED_SPA_PATHS_RE.match(full_path):
             raise HTTPException(status_code=404, detail="Not Found")
-        index_path = _dist_dir / "index.html"
-        if index_path.exists():
-            return FileResponse(str(index_path))
-        raise HTTPException(status_code=404, detail="Not Found")
+        return _index_response(request)
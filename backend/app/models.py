@@ -1,5 +1,6 @@
 from __future__ import annotations
-from sqlalchemy import Column, Integer, String, Boolean, Float, Text, DateTime, func, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Boolean, Float, Text, DateTime, func, ForeignKey, Index, asc, desc
 from .db import Base
 
 class UserORM(Base):
@@ -9,13 +10,17 @@ class UserORM(Base):
     username = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     is_admin = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Serves the case-insensitive `lower(username) = ?` uniqueness check
+    __table_args__ = (Index("ix_users_username_lower", func.lower(username)),)
 
 class GearItemORM(Base):
     __tablename__ = "gear_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False, index=True)
+    # NOCASE makes plain comparisons and LIKE on name case-insensitive
+    name = Column(String(255, collation="NOCASE"), nullable=False)
     category = Column(String(50), nullable=False, index=True)
     brand = Column(String(100), nullable=False, index=True)
     price = Column(Float, nullable=False)
@@ -23,7 +28,21 @@ class GearItemORM(Base):
     rating = Column(Float, nullable=True)
     description = Column(Text, nullable=True)
     image_url = Column(String(512), nullable=True)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Serves ORDER BY name COLLATE NOCASE, the keyset cursor and prefix LIKE. The column
+    # collation only applies to new tables, so the index names NOCASE explicitly to also
+    # cover databases whose name column predates it.
+    __table_args__ = (Index("ix_gear_items_name_nocase", name.collate("NOCASE")),)
+
+# Case-insensitive name key shared by the gear listings' ORDER BY and keyset cursor
+GEAR_NAME_NOCASE = GearItemORM.name.collate("NOCASE")
+# ORDER BY clauses common to the catalog and admin gear listings
+GEAR_SORT_ORDER = {
+    "name_asc": [asc(GEAR_NAME_NOCASE), asc(GearItemORM.id)],
+    "price_asc": [asc(GearItemORM.price), asc(GEAR_NAME_NOCASE)],
+    "price_desc": [desc(GearItemORM.price), asc(GEAR_NAME_NOCASE)],
+}
 
 class CartItemORM(Base):
     __tablename__ = "cart_items"
@@ -32,4 +51,7 @@ class CartItemORM(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     gear_item_id = Column(Integer, ForeignKey("gear_items.id", ondelete="CASCADE"), nullable=False)
     quantity = Column(Integer, nullable=False, default=1)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # One row per (user, gear item); also backs the add-to-cart lookup
+    __table_args__ = (Index("ux_cart_items_user_gear", "user_id", "gear_item_id", unique=True),)
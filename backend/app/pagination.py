@@ -0,0 +1,57 @@
+from __future__ import annotations
+from typing import Any
+
+from sqlalchemy import Select, select, func, or_
+from sqlalchemy.orm import Session
+
+
+def fetch_page(
+    db: Session, query: Select, page: int, page_size: int, total: int | None = None
+) -> tuple[list[Any], int, int, int]:
+    """Run a paginated ORM query and return (items, total, page, pages).
+
+    The total is projected next to each row as `count(*) OVER ()`, so the page and
+    its total come back in one round trip. Callers that already know the total (an
+    unfiltered listing with a cached row count) pass it in and skip counting.
+    `page` is clamped to the last page.
+    """
+    if total is not None:
+        pages = max(1, (total + page_size - 1) // page_size)
+        page = min(page, pages)
+        items = db.execute(query.offset((page - 1) * page_size).limit(page_size)).scalars().all()
+        return list(items), total, page, pages
+
+    windowed = query.add_columns(func.count().over().label("total"))
+    rows = db.execute(windowed.offset((page - 1) * page_size).limit(page_size)).all()
+    if rows:
+        total = rows[0].total
+    else:
+        # Empty page: count the filtered query itself rather than rebuilding its WHERE clause
+        total = db.execute(select(func.count()).select_from(query.order_by(None).subquery())).scalar_one()
+
+    pages = max(1, (total + page_size - 1) // page_size)
+    if page > pages:
+        page = pages
+        if total:
+            rows = db.execute(windowed.offset((page - 1) * page_size).limit(page_size)).all()
+
+    return [row[0] for row in rows], total, page, pages
+
+
+def fetch_slice(db: Session, query: Select, page: int, page_size: int) -> tuple[list[Any], bool]:
+    """Run a paginated ORM query without counting and return (items, has_more).
+
+    One extra row is fetched to tell whether a next page exists.
+    """
+    items = db.execute(query.offset((page - 1) * page_size).limit(page_size + 1)).scalars().all()
+    return list(items[:page_size]), len(items) > page_size
+
+
+def seek_after(query: Select, name_key: Any, id_key: Any, after_name: str, after_id: int) -> Select:
+    """Restrict a `(name_key, id_key)`-ordered query to the rows after a keyset cursor.
+
+    `(name, id) > (:n, :id)` is spelled out as `name >= :n AND (name > :n OR id > :id)`:
+    SQLite does not range-seek on a row-value comparison, but the leading `name >= :n`
+    lets it start the index scan at the cursor instead of at the first row.
+    """
+    return query.where(name_key >= after_name, or_(name_key > after_name, id_key > after_id))
@@ -1,18 +1,37 @@
 from __future__ import annotations
 from typing import Optional
 
-from fastapi import Depends, HTTPException, Query, Path as PathParam, APIRouter
-from sqlalchemy import select, func, asc, desc
+from fastapi import Depends, HTTPException, Query, Path as PathParam, APIRouter, Response
+from sqlalchemy import select, insert, delete, func, asc, desc
 from sqlalchemy.orm import Session
 
 from ..db import get_db
-from ..models import UserORM, GearItemORM, CartItemORM
-from ..schemas import User, GearItem, GearItemCreate, GearItemUpdate, PagedResponse, Category, UserInfo, PagedUsersResponse
-from ..auth import get_current_admin
+from ..pagination import fetch_page, fetch_slice, seek_after
+from ..models import UserORM, GearItemORM, CartItemORM, GEAR_NAME_NOCASE, GEAR_SORT_ORDER
+from ..schemas import User, GearItem, GearItemCreate, GearItemUpdate, PagedResponse, Category, UserInfo, PagedUsersResponse, AdminGearSort, UserSort
+from ..auth import get_current_admin, invalidate_cached_user
+from .catalog import gear_total, invalidate_catalog_cache
 
 
 router = APIRouter(prefix="/api", tags=["Admin"])
 
+# ORDER BY clauses per `sort` value, built once at import
+_GEAR_SORT_ORDER = {
+    **GEAR_SORT_ORDER,
+    "name_desc": [desc(GEAR_NAME_NOCASE)],
+    "rating_desc": [desc(GearItemORM.rating), asc(GEAR_NAME_NOCASE)],
+    "id_asc": [asc(GearItemORM.id)],
+    "id_desc": [desc(GearItemORM.id)],
+}
+_USER_SORT_ORDER = {
+    "username_asc": [asc(func.lower(UserORM.username)), asc(UserORM.id)],
+    "username_desc": [desc(func.lower(UserORM.username))],
+    "id_asc": [asc(UserORM.id)],
+    "id_desc": [desc(UserORM.id)],
+    # Administratorzy na górze sortowani po ID, potem zwykli użytkownicy sortowani po ID
+    "admin_first": [desc(UserORM.is_admin), asc(UserORM.id)],
+}
+
 
 @router.get(
     "/admin/gear",
@@ -25,12 +44,22 @@ Retrieve a paginated list of all audio gear items with advanced filtering and so
 async def admin_list_gear(
     category: Category | None = Query(default=None, description="Filter by category"),
     q: Optional[str] = Query(default=None, description="Search in product name"),
-    sort: Optional[str] = Query(default="name_asc", description="Sort by: name_asc, name_desc, price_asc, price_desc, rating_desc, id_asc, id_desc"),
+    sort: AdminGearSort = Query(default="name_asc", description="Sort by: name_asc, name_desc, price_asc, price_desc, rating_desc, id_asc, id_desc"),
     page: int = Query(default=1, ge=1, description="Page number"),
-    page_size: int = Query(default=20, ge=1, le=1000, description="Items per page"),
+    page_size: int = Query(default=20, ge=1, le=100, description="Items per page (max 100)"),
+    include_total: bool = Query(default=False, description="Also return total and pages (runs a count)"),
+    after_name: Optional[str] = Query(default=None, description="Keyset cursor: name of the last item seen (with after_id, name_asc only)"),
+    after_id: Optional[int] = Query(default=None, description="Keyset cursor: id of the last item seen (with after_name, name_asc only)"),
     _: User = Depends(get_current_admin),
     db: Session = Depends(get_db),
-) -> PagedResponse:
+) -> Response:
+    seek = after_name is not None or after_id is not None
+    if seek:
+        if after_name is None or after_id is None:
+            raise HTTPException(status_code=400, detail="after_name and after_id must be given together")
+        if sort != "name_asc":
+            raise HTTPException(status_code=400, detail="Keyset cursor requires sort=name_asc")
+
     # Build base query
     filters = []
     if category:
@@ -43,53 +72,29 @@ async def admin_list_gear(
     # Search
     q_norm = (q or "").strip().lower()
     if q_norm:
-        query = query.where(func.lower(GearItemORM.name).like(f"%{q_norm}%"))
+        query = query.where(GearItemORM.name.like(f"%{q_norm}%"))
 
     # Sorting
-    if sort == "name_desc":
-        query = query.order_by(desc(func.lower(GearItemORM.name)))
-    elif sort == "price_asc":
-        query = query.order_by(asc(GearItemORM.price), asc(func.lower(GearItemORM.name)))
-    elif sort == "price_desc":
-        query = query.order_by(desc(GearItemORM.price), asc(func.lower(GearItemORM.name)))
-    elif sort == "rating_desc":
-        query = query.order_by(desc(GearItemORM.rating), asc(func.lower(GearItemORM.name)))
-    elif sort == "id_asc":
-        query = query.order_by(asc(GearItemORM.id))
-    elif sort == "id_desc":
-        query = query.order_by(desc(GearItemORM.id))
-    else:  # name_asc (default)
-        query = query.order_by(asc(func.lower(GearItemORM.name)))
-
-    # Count total
-    count_stmt = select(func.count(GearItemORM.id))
-    if filters:
-        count_stmt = count_stmt.where(*filters)
-    if q_norm:
-        count_stmt = count_stmt.where(func.lower(GearItemORM.name).like(f"%{q_norm}%"))
-    total = db.execute(count_stmt).scalar_one()
-
-    pages = max(1, (total + page_size - 1) // page_size)
-    if page > pages:
-        page = pages
-    start = (page - 1) * page_size
+    query = query.order_by(*_GEAR_SORT_ORDER[sort])
 
-    items = db.execute(query.offset(start).limit(page_size)).scalars().all()
+    if seek:
+        query = seek_after(query, GEAR_NAME_NOCASE, GearItemORM.id, after_name, after_id)
+        page = 1
 
-    def to_schema(m: GearItemORM) -> GearItem:
-        return GearItem(
-            id=m.id,
-            name=m.name,
-            category=m.category,  # type: ignore
-            brand=m.brand,
-            price=m.price,
-            in_stock=m.in_stock,
-            rating=m.rating,
-            description=m.description,
-            image_url=m.image_url,
-        )
+    if include_total:
+        total = gear_total(db) if not (category or q_norm or seek) else None
+        items, total, page, pages = fetch_page(db, query, page, page_size, total)
+        has_more = page < pages
+    else:
+        items, has_more = fetch_slice(db, query, page, page_size)
+        total = pages = None
 
-    return PagedResponse(items=[to_schema(i) for i in items], total=total, page=page, page_size=page_size, pages=pages)
+    # Serialize once here (pydantic-core) instead of letting FastAPI re-validate and re-encode the page
+    body = PagedResponse(
+        items=[GearItem.model_validate(i) for i in items],
+        total=total, page=page, page_size=page_size, pages=pages, has_more=has_more,
+    ).model_dump_json()
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
@@ -98,53 +103,57 @@ async def admin_list_gear(
     summary="List All Users 🔒",
     description="""
 Retrieve a paginated list of all registered users with search and sorting capabilities. **Requires admin privileges.**
+
+With `sort=username_asc`, `after_username` + `after_id` (the last user already seen) return the next users
+without OFFSET. With a cursor, `total` and `pages` count only the users after it.
     """,
 )
 async def admin_list_users(
     q: Optional[str] = Query(default=None, description="Search in username"),
-    sort: Optional[str] = Query(default="admin_first", description="Sort by: username_asc, username_desc, id_asc, id_desc, admin_first"),
+    sort: UserSort = Query(default="admin_first", description="Sort by: username_asc, username_desc, id_asc, id_desc, admin_first"),
     page: int = Query(default=1, ge=1, description="Page number"),
-    page_size: int = Query(default=20, ge=1, le=1000, description="Items per page"),
+    page_size: int = Query(default=20, ge=1, le=100, description="Items per page (max 100)"),
+    include_total: bool = Query(default=False, description="Also return total and pages (runs a count)"),
+    after_username: Optional[str] = Query(default=None, description="Keyset cursor: username of the last user seen (with after_id, username_asc only)"),
+    after_id: Optional[int] = Query(default=None, description="Keyset cursor: id of the last user seen (with after_username, username_asc only)"),
     _: User = Depends(get_current_admin),
     db: Session = Depends(get_db),
 ) -> PagedUsersResponse:
+    seek = after_username is not None or after_id is not None
+    if seek:
+        if after_username is None or after_id is None:
+            raise HTTPException(status_code=400, detail="after_username and after_id must be given together")
+        if sort != "username_asc":
+            raise HTTPException(status_code=400, detail="Keyset cursor requires sort=username_asc")
+
     # Build base query
     query = select(UserORM)
 
     # Search
     q_norm = (q or "").strip().lower()
     if q_norm:
-        query = query.where(func.lower(UserORM.username).like(f"%{q_norm}%"))
+        query = query.where(UserORM.username.like(f"%{q_norm}%"))
 
     # Sorting
-    if sort == "username_desc":
-        query = query.order_by(desc(func.lower(UserORM.username)))
-    elif sort == "id_asc":
-        query = query.order_by(asc(UserORM.id))
-    elif sort == "id_desc":
-        query = query.order_by(desc(UserORM.id))
-    elif sort == "admin_first":
-        # Administratorzy na górze sortowani po ID, potem zwykli użytkownicy sortowani po ID
-        query = query.order_by(desc(UserORM.is_admin), asc(UserORM.id))
-    else:  # username_asc
-        query = query.order_by(asc(func.lower(UserORM.username)))
-
-    # Count total
-    count_stmt = select(func.count(UserORM.id))
-    if q_norm:
-        count_stmt = count_stmt.where(func.lower(UserORM.username).like(f"%{q_norm}%"))
-    total = db.execute(count_stmt).scalar_one()
+    query = query.order_by(*_USER_SORT_ORDER[sort])
 
-    pages = max(1, (total + page_size - 1) // page_size)
-    if page > pages:
-        page = pages
-    start = (page - 1) * page_size
+    if seek:
+        # ix_users_username_lower serves the lower(username) range
+        query = seek_after(query, func.lower(UserORM.username), UserORM.id, after_username.lower(), after_id)
+        page = 1
 
-    users = db.execute(query.offset(start).limit(page_size)).scalars().all()
+    if include_total:
+        users, total, page, pages = fetch_page(db, query, page, page_size)
+        has_more = page < pages
+    else:
+        users, has_more = fetch_slice(db, query, page, page_size)
+        total = pages = None
 
-    user_items = [UserInfo(id=u.id, username=u.username, is_admin=u.is_admin) for u in users]
+    user_items = [UserInfo.model_validate(u) for u in users]
 
-    return PagedUsersResponse(items=user_items, total=total, page=page, page_size=page_size, pages=pages)
+    return PagedUsersResponse(
+        items=user_items, total=total, page=page, page_size=page_size, pages=pages, has_more=has_more
+    )
 
 
 @router.delete(
@@ -174,13 +183,12 @@ async def admin_delete_user(
         raise HTTPException(status_code=403, detail="Cannot delete the default admin account")
     
     # Delete user's cart items first (foreign key constraint)
-    cart_items = db.execute(select(CartItemORM).where(CartItemORM.user_id == user_id)).scalars().all()
-    for item in cart_items:
-        db.delete(item)
+    db.execute(delete(CartItemORM).where(CartItemORM.user_id == user_id))
     
     # Delete the user
     db.delete(user_to_delete)
     db.commit()
+    invalidate_cached_user(user_to_delete.username)
     
     return
 
@@ -195,11 +203,11 @@ Add a new audio gear item to the catalog. **Requires admin privileges.**
     """,
 )
 async def create_gear_item(payload: GearItemCreate, _: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    m = GearItemORM(**payload.model_dump())
-    db.add(m)
+    # INSERT ... RETURNING hands back the generated id without a follow-up SELECT
+    m = db.execute(insert(GearItemORM).values(**payload.model_dump()).returning(GearItemORM)).scalar_one()
     db.commit()
-    db.refresh(m)
-    return GearItem(id=m.id, **payload.model_dump())
+    invalidate_catalog_cache()
+    return GearItem.model_validate(m)
 
 
 @router.patch(
@@ -222,18 +230,9 @@ async def update_gear_item(
     for k, v in payload.model_dump(exclude_unset=True).items():
         setattr(m, k, v)
     db.commit()
-    db.refresh(m)
-    return GearItem(
-        id=m.id,
-        name=m.name,
-        category=m.category,  # type: ignore
-        brand=m.brand,
-        price=m.price,
-        in_stock=m.in_stock,
-        rating=m.rating,
-        description=m.description,
-        image_url=m.image_url,
-    )
+    invalidate_catalog_cache()
+    # Sessions keep attributes after commit (expire_on_commit=False), so no reload SELECT is needed
+    return GearItem.model_validate(m)
 
 
 @router.delete(
@@ -254,4 +253,5 @@ async def delete_gear_item(
         raise HTTPException(status_code=404, detail="Item not found")
     db.delete(m)
     db.commit()
+    invalidate_catalog_cache()
     return
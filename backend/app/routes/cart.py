@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from fastapi import Depends, HTTPException, APIRouter
-from sqlalchemy import select
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from ..db import get_db
-from ..models import UserORM, GearItemORM, CartItemORM
+from ..models import GearItemORM, CartItemORM
 from ..schemas import User, GearItem, CartItemAdd, CartItemUpdate, CartItemResponse, CartResponse
 from ..auth import get_current_user
 
@@ -13,6 +14,32 @@ from ..auth import get_current_user
 router = APIRouter(prefix="/api", tags=["User"])
 
 
+def _load_cart(db: Session, user_id: int) -> CartResponse:
+    """Build the cart response for an already resolved user id"""
+    # Get cart items with gear details in a single query
+    rows = db.execute(
+        select(CartItemORM, GearItemORM)
+        .join(GearItemORM, GearItemORM.id == CartItemORM.gear_item_id)
+        .where(CartItemORM.user_id == user_id)
+        .order_by(CartItemORM.id)
+    ).all()
+    
+    items_response = []
+    total = 0.0
+    
+    for cart_item, gear in rows:
+        gear_schema = GearItem.model_validate(gear)
+        items_response.append(CartItemResponse(
+            id=cart_item.id,
+            gear_item_id=cart_item.gear_item_id,
+            quantity=cart_item.quantity,
+            gear_item=gear_schema
+        ))
+        total += gear.price * cart_item.quantity
+    
+    return CartResponse(items=items_response, total=total)
+
+
 @router.get(
     "/me",
     response_model=User,
@@ -25,6 +52,7 @@ router = APIRouter(prefix="/api", tags=["User"])
             "content": {
                 "application/json": {
                     "example": {
+                        "id": 1,
                         "username": "admin",
                         "is_admin": True
                     }
@@ -64,42 +92,7 @@ Requires a valid JWT token. The cart is user-specific and isolated per account.
     response_description="User's shopping cart with items and total price",
 )
 async def get_cart(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Get user_id
-    user = db.execute(select(UserORM).where(UserORM.username == current_user.username)).scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Get cart items with gear details
-    cart_items = db.execute(
-        select(CartItemORM).where(CartItemORM.user_id == user.id)
-    ).scalars().all()
-    
-    items_response = []
-    total = 0.0
-    
-    for cart_item in cart_items:
-        gear = db.execute(select(GearItemORM).where(GearItemORM.id == cart_item.gear_item_id)).scalar_one_or_none()
-        if gear:
-            gear_schema = GearItem(
-                id=gear.id,
-                name=gear.name,
-                category=gear.category,  # type: ignore
-                brand=gear.brand,
-                price=gear.price,
-                in_stock=gear.in_stock,
-                rating=gear.rating,
-                description=gear.description,
-                image_url=gear.image_url,
-            )
-            items_response.append(CartItemResponse(
-                id=cart_item.id,
-                gear_item_id=cart_item.gear_item_id,
-                quantity=cart_item.quantity,
-                gear_item=gear_schema
-            ))
-            total += gear.price * cart_item.quantity
-    
-    return CartResponse(items=items_response, total=total)
+    return _load_cart(db, current_user.id)
 
 
 @router.post(
@@ -116,38 +109,26 @@ Add a gear item to the user's shopping cart. **Requires authentication.**
     """,
 )
 async def add_to_cart(payload: CartItemAdd, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Get user_id
-    user = db.execute(select(UserORM).where(UserORM.username == current_user.username)).scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Check if gear item exists
     gear = db.execute(select(GearItemORM).where(GearItemORM.id == payload.gear_item_id)).scalar_one_or_none()
     if not gear:
         raise HTTPException(status_code=404, detail="Gear item not found")
     
-    # Check if item already in cart
-    existing = db.execute(
-        select(CartItemORM).where(
-            CartItemORM.user_id == user.id,
-            CartItemORM.gear_item_id == payload.gear_item_id
-        )
-    ).scalar_one_or_none()
-    
-    if existing:
-        existing.quantity += payload.quantity
-    else:
-        new_item = CartItemORM(
-            user_id=user.id,
-            gear_item_id=payload.gear_item_id,
-            quantity=payload.quantity
-        )
-        db.add(new_item)
-    
+    # Insert or bump the quantity in one statement (unique on user_id + gear_item_id)
+    stmt = sqlite_insert(CartItemORM).values(
+        user_id=current_user.id,
+        gear_item_id=payload.gear_item_id,
+        quantity=payload.quantity
+    ).on_conflict_do_update(
+        index_elements=["user_id", "gear_item_id"],
+        set_={"quantity": CartItemORM.quantity + payload.quantity}
+    )
+    db.execute(stmt)
+
+    # Read the updated cart in the same transaction, then commit once
+    cart = _load_cart(db, current_user.id)
     db.commit()
-    
-    # Return updated cart
-    return await get_cart(current_user, db)
+    return cart
 
 
 @router.patch(
@@ -168,16 +149,11 @@ async def update_cart_item(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Get user_id
-    user = db.execute(select(UserORM).where(UserORM.username == current_user.username)).scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Get cart item
     cart_item = db.execute(
         select(CartItemORM).where(
             CartItemORM.id == cart_item_id,
-            CartItemORM.user_id == user.id
+            CartItemORM.user_id == current_user.id
         )
     ).scalar_one_or_none()
     
@@ -188,11 +164,12 @@ async def update_cart_item(
         db.delete(cart_item)
     else:
         cart_item.quantity = payload.quantity
-    
+    db.flush()
+
+    # Read the updated cart in the same transaction, then commit once
+    cart = _load_cart(db, current_user.id)
     db.commit()
-    
-    # Return updated cart
-    return await get_cart(current_user, db)
+    return cart
 
 
 @router.delete(
@@ -211,16 +188,11 @@ async def remove_from_cart(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Get user_id
-    user = db.execute(select(UserORM).where(UserORM.username == current_user.username)).scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Get cart item
     cart_item = db.execute(
         select(CartItemORM).where(
             CartItemORM.id == cart_item_id,
-            CartItemORM.user_id == user.id
+            CartItemORM.user_id == current_user.id
         )
     ).scalar_one_or_none()
     
@@ -228,10 +200,12 @@ async def remove_from_cart(
         raise HTTPException(status_code=404, detail="Cart item not found")
     
     db.delete(cart_item)
+    db.flush()
+
+    # Read the updated cart in the same transaction, then commit once
+    cart = _load_cart(db, current_user.id)
     db.commit()
-    
-    # Return updated cart
-    return await get_cart(current_user, db)
+    return cart
 
 
 @router.delete(
@@ -245,19 +219,8 @@ Remove **all items** from the user's shopping cart. **Requires authentication.**
     """,
 )
 async def clear_cart_endpoint(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Get user_id
-    user = db.execute(select(UserORM).where(UserORM.username == current_user.username)).scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Delete all cart items for user
-    cart_items = db.execute(
-        select(CartItemORM).where(CartItemORM.user_id == user.id)
-    ).scalars().all()
-    
-    for item in cart_items:
-        db.delete(item)
-    
+    db.execute(delete(CartItemORM).where(CartItemORM.user_id == current_user.id))
     db.commit()
     
     return CartResponse(items=[], total=0.0)
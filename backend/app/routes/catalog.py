@@ -1,20 +1,126 @@
 from __future__ import annotations
-from typing import Optional
+import threading
+from typing import Optional, get_args
 
-from fastapi import Depends, HTTPException, Query, Path as PathParam, APIRouter
-from sqlalchemy import select, func, asc, desc
+import orjson
+from cachetools import TTLCache
+
+from fastapi import Depends, HTTPException, Query, Path as PathParam, APIRouter, Response
+from sqlalchemy import select, func, asc
 from sqlalchemy.orm import Session
 
 from ..db import get_db
-from ..models import GearItemORM
-from ..schemas import GearItem, Category, PagedResponse
+from ..pagination import fetch_page, fetch_slice, seek_after
+from ..models import GearItemORM, GEAR_NAME_NOCASE, GEAR_SORT_ORDER
+from ..schemas import GearItem, Category, GearSort, PagedResponse
 
 
 router = APIRouter(prefix="/api", tags=["Catalog"])
 
+# Catalog reads keyed by their query parameters. Admin writes clear it through
+# invalidate_catalog_cache(); the TTL bounds staleness in other worker processes.
+# Keys come from anonymous clients, so the cache is bounded by bytes, not entries:
+# list bodies are charged by length, items and counts at a flat rate.
+_CATALOG_CACHE_BYTES = 16 * 1024 * 1024
+_CATALOG_CACHE_MAX_BODY = 1024 * 1024  # larger pages are served but not cached
+_catalog_cache: TTLCache = TTLCache(
+    maxsize=_CATALOG_CACHE_BYTES, ttl=300, getsizeof=lambda v: len(v) if isinstance(v, str) else 1024
+)
+_catalog_cache_lock = threading.Lock()
+# Bumped on every invalidation; a read that started before it must not be stored
+_catalog_cache_generation = 0
+
+
+# ORDER BY clauses per `sort` value, built once at import
+_GEAR_SORT_ORDER = {
+    **GEAR_SORT_ORDER,
+    "relevance": GEAR_SORT_ORDER["name_asc"],  # without a search query
+    "rating_desc": [GearItemORM.rating.desc().nulls_last(), asc(GearItemORM.price)],
+    "in_stock": [asc(~GearItemORM.in_stock), asc(GearItemORM.price)],
+}
+
+# Categories mirror the `Category` literal and never change at runtime
+_CATEGORIES_BODY = orjson.dumps(list(get_args(Category)))
+
+
+def invalidate_catalog_cache() -> None:
+    global _catalog_cache_generation
+    with _catalog_cache_lock:
+        _catalog_cache_generation += 1
+        _catalog_cache.clear()
+
+
+def _cache_lookup(key: tuple) -> tuple[object | None, int]:
+    """Return the cached value (or None) and the generation to pass to _cache_store()."""
+    with _catalog_cache_lock:
+        return _catalog_cache.get(key), _catalog_cache_generation
+
+
+def _cache_store(key: tuple, value: object, generation: int) -> None:
+    """Cache `value` unless the cache was invalidated after `generation` was read."""
+    if isinstance(value, str) and len(value) > _CATALOG_CACHE_MAX_BODY:
+        return
+    with _catalog_cache_lock:
+        if generation == _catalog_cache_generation:
+            _catalog_cache[key] = value
+
+
+def gear_total(db: Session) -> int:
+    """Row count of the whole catalog, for listings without filters or a cursor."""
+    total, generation = _cache_lookup(("gear_total",))
+    if total is None:
+        total = db.execute(select(func.count()).select_from(GearItemORM)).scalar_one()
+        _cache_store(("gear_total",), total, generation)
+    return total
+
+
+def _relevance_page(
+    db: Session, filters: list, q_norm: str, page: int, page_size: int, include_total: bool
+) -> tuple[list[GearItemORM], int | None, int, int | None, bool]:
+    """One page of search results in relevance order: (items, total, page, pages, has_more).
+
+    Names starting with the query come first. `name LIKE 'q%'` on the NOCASE name is an
+    index range search, so it runs alone and only up to the end of the requested page;
+    the `%q%` scan for the remaining matches runs only when prefix hits don't fill it.
+    """
+    total = pages = None
+    if include_total:
+        total = db.execute(
+            select(func.count()).select_from(GearItemORM).where(*filters, GearItemORM.name.like(f"%{q_norm}%"))
+        ).scalar_one()
+        pages = max(1, (total + page_size - 1) // page_size)
+        page = min(page, pages)
+
+    offset = (page - 1) * page_size
+    window = offset + page_size + 1  # one extra row tells whether a next page exists
+    prefix = GearItemORM.name.like(f"{q_norm}%")
+    prefix_hits = db.execute(
+        select(GearItemORM)
+        .where(*filters, prefix)
+        .order_by(asc(func.length(GearItemORM.name)), asc(GEAR_NAME_NOCASE), asc(GearItemORM.id))
+        .limit(window)
+    ).scalars().all()
+    rows = list(prefix_hits[offset:])
+    if len(prefix_hits) < window:
+        # Every prefix hit is known; continue with the other matches, closest match position first
+        rows += db.execute(
+            select(GearItemORM)
+            .where(*filters, GearItemORM.name.like(f"%{q_norm}%"), ~prefix)
+            .order_by(
+                asc(func.instr(func.lower(GearItemORM.name), q_norm)),
+                asc(func.length(GearItemORM.name)),
+                asc(GEAR_NAME_NOCASE),
+                asc(GearItemORM.id),
+            )
+            .offset(max(0, offset - len(prefix_hits)))
+            .limit(page_size + 1 - len(rows))
+        ).scalars().all()
+    return rows[:page_size], total, page, pages, len(rows) > page_size
+
 
 @router.get(
     "/categories",
+    response_model=list[Category],
     summary="List Available Categories",
     description="Retrieve all available product categories in the catalog. Use these values for filtering gear items.",
     response_description="List of available categories",
@@ -29,8 +135,8 @@ router = APIRouter(prefix="/api", tags=["Catalog"])
         }
     }
 )
-def list_categories() -> list[Category]:
-    return ["microphone", "headphones", "interface"]
+def list_categories() -> Response:
+    return Response(content=_CATEGORIES_BODY, media_type="application/json")
 
 
 @router.get(
@@ -53,6 +159,10 @@ Retrieve a paginated list of audio gear items with advanced filtering and sortin
   * `in_stock` - In-stock items first
 * **page** - Page number (starts at 1)
 * **page_size** - Items per page (1-1000, default: 12)
+* **include_total** - Also return `total` and `pages` (default: false; `has_more` is always returned)
+* **after_name**, **after_id** - Keyset cursor: name and id of the last item already seen.
+  Returns the items after it without skipping rows via OFFSET (alphabetical order only).
+  With a cursor, `total` and `pages` count only the items after it.
 
 ### Examples
 
@@ -60,6 +170,7 @@ Retrieve a paginated list of audio gear items with advanced filtering and sortin
 * Search for "Shure": `?q=shure`
 * Top rated interfaces: `?category=interface&sort=rating_desc`
 * Cheapest headphones: `?category=headphones&sort=price_asc`
+* Next page after "Shure SM58" (id 1): `?sort=name_asc&after_name=Shure SM58&after_id=1`
     """,
     response_description="Paginated list of gear items with metadata",
     responses={
@@ -84,7 +195,8 @@ Retrieve a paginated list of audio gear items with advanced filtering and sortin
                         "total": 14,
                         "page": 1,
                         "page_size": 12,
-                        "pages": 2
+                        "pages": 2,
+                        "has_more": True
                     }
                 }
             }
@@ -94,72 +206,65 @@ Retrieve a paginated list of audio gear items with advanced filtering and sortin
 def list_gear(
     category: Category | None = Query(default=None, description="Filter by category (microphone, headphones, interface)"),
     q: Optional[str] = Query(default=None, description="Search in product name (case-insensitive)"),
-    sort: Optional[str] = Query(default="relevance", description="Sort by: relevance, price_asc, price_desc, name_asc, rating_desc, in_stock"),
+    sort: GearSort = Query(default="relevance", description="Sort by: relevance, price_asc, price_desc, name_asc, rating_desc, in_stock"),
     page: int = Query(default=1, ge=1, description="Page number (starting from 1)"),
     page_size: int = Query(default=12, ge=1, le=1000, description="Number of items per page"),
+    include_total: bool = Query(default=False, description="Also return total and pages (runs a count)"),
+    after_name: Optional[str] = Query(default=None, description="Keyset cursor: name of the last item seen (with after_id)"),
+    after_id: Optional[int] = Query(default=None, description="Keyset cursor: id of the last item seen (with after_name)"),
     db: Session = Depends(get_db),
-) -> PagedResponse:
+) -> Response:
+    q_norm = (q or "").strip().lower()
+    seek = after_name is not None or after_id is not None
+    if seek:
+        if after_name is None or after_id is None:
+            raise HTTPException(status_code=400, detail="after_name and after_id must be given together")
+        if sort != "name_asc" and not (sort == "relevance" and not q_norm):
+            raise HTTPException(status_code=400, detail="Keyset cursor requires alphabetical sort (name_asc)")
+    cache_key = ("gear", category, q_norm, sort, page, page_size, include_total, after_name, after_id)
+    cached, generation = _cache_lookup(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     # Build base query
     filters = []
     if category:
         filters.append(GearItemORM.category == category)
 
-    query = select(GearItemORM)
-    if filters:
-        query = query.where(*filters)
+    if sort == "relevance" and q_norm:
+        items, total, page, pages, has_more = _relevance_page(db, filters, q_norm, page, page_size, include_total)
+    else:
+        query = select(GearItemORM)
+        if filters:
+            query = query.where(*filters)
 
-    # Search
-    q_norm = (q or "").strip().lower()
-    if q_norm:
-        query = query.where(func.lower(GearItemORM.name).like(f"%{q_norm}%"))
-
-    # Sorting
-    if sort == "price_asc":
-        query = query.order_by(asc(GearItemORM.price), asc(func.lower(GearItemORM.name)))
-    elif sort == "price_desc":
-        query = query.order_by(desc(GearItemORM.price), asc(func.lower(GearItemORM.name)))
-    elif sort == "name_asc":
-        query = query.order_by(asc(func.lower(GearItemORM.name)))
-    elif sort == "rating_desc":
-        query = query.order_by(desc(GearItemORM.rating.nulls_last()), asc(GearItemORM.price)) if hasattr(GearItemORM.rating, 'nulls_last') else query.order_by(desc(GearItemORM.rating))
-    elif sort == "in_stock":
-        query = query.order_by(asc(~GearItemORM.in_stock), asc(GearItemORM.price))
-    else:  # relevance / default
+        # Search
         if q_norm:
-            # Rank by position of match and then by name length
-            query = query.order_by(asc(func.instr(func.lower(GearItemORM.name), q_norm)), asc(func.length(GearItemORM.name)))
+            query = query.where(GearItemORM.name.like(f"%{q_norm}%"))
+
+        query = query.order_by(*_GEAR_SORT_ORDER[sort])
+
+        if seek:
+            # Pages are counted from the cursor; OFFSET stays for jumping to an arbitrary page
+            query = seek_after(query, GEAR_NAME_NOCASE, GearItemORM.id, after_name, after_id)
+            page = 1
+
+        if include_total:
+            # Unfiltered listings reuse the cached catalog size instead of counting every row
+            total = gear_total(db) if not (category or q_norm or seek) else None
+            items, total, page, pages = fetch_page(db, query, page, page_size, total)
+            has_more = page < pages
         else:
-            query = query.order_by(asc(func.lower(GearItemORM.name)))
-
-    # Count total
-    count_stmt = select(func.count(GearItemORM.id))
-    if filters:
-        count_stmt = count_stmt.where(*filters)
-    if q_norm:
-        count_stmt = count_stmt.where(func.lower(GearItemORM.name).like(f"%{q_norm}%"))
-    total = db.execute(count_stmt).scalar_one()
-
-    pages = max(1, (total + page_size - 1) // page_size)
-    if page > pages:
-        page = pages
-    start = (page - 1) * page_size
-
-    items = db.execute(query.offset(start).limit(page_size)).scalars().all()
-
-    def to_schema(m: GearItemORM) -> GearItem:
-        return GearItem(
-            id=m.id,
-            name=m.name,
-            category=m.category,  # type: ignore
-            brand=m.brand,
-            price=m.price,
-            in_stock=m.in_stock,
-            rating=m.rating,
-            description=m.description,
-            image_url=m.image_url,
-        )
-
-    return PagedResponse(items=[to_schema(i) for i in items], total=total, page=page, page_size=page_size, pages=pages)
+            items, has_more = fetch_slice(db, query, page, page_size)
+            total = pages = None
+
+    # Serialize once here (pydantic-core) instead of letting FastAPI re-validate and re-encode the page
+    body = PagedResponse(
+        items=[GearItem.model_validate(i) for i in items],
+        total=total, page=page, page_size=page_size, pages=pages, has_more=has_more,
+    ).model_dump_json()
+    _cache_store(cache_key, body, generation)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
@@ -201,17 +306,14 @@ def get_gear_item(
     item_id: int = PathParam(..., description="Unique identifier of the gear item"),
     db: Session = Depends(get_db)
 ) -> GearItem:
+    cache_key = ("item", item_id)
+    cached, generation = _cache_lookup(cache_key)
+    if cached is not None:
+        return cached
+
     m = db.execute(select(GearItemORM).where(GearItemORM.id == item_id)).scalar_one_or_none()
     if not m:
         raise HTTPException(status_code=404, detail="Item not found")
-    return GearItem(
-        id=m.id,
-        name=m.name,
-        category=m.category,  # type: ignore
-        brand=m.brand,
-        price=m.price,
-        in_stock=m.in_stock,
-        rating=m.rating,
-        description=m.description,
-        image_url=m.image_url,
-    )
+    item = GearItem.model_validate(m)
+    _cache_store(cache_key, item, generation)
+    return item
@@ -1,10 +1,17 @@
 from __future__ import annotations
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Literal, Optional
 
 Category = Literal["microphone", "headphones", "interface"]
 
+# Accepted `sort` values of the list endpoints
+GearSort = Literal["relevance", "price_asc", "price_desc", "name_asc", "rating_desc", "in_stock"]
+AdminGearSort = Literal["name_asc", "name_desc", "price_asc", "price_desc", "rating_desc", "id_asc", "id_desc"]
+UserSort = Literal["username_asc", "username_desc", "id_asc", "id_desc", "admin_first"]
+
 class GearItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     category: Category
@@ -38,10 +45,11 @@ class GearItemUpdate(BaseModel):
 
 class PagedResponse(BaseModel):
     items: list[GearItem]
-    total: int
+    total: Optional[int] = None  # only with include_total=true
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None  # only with include_total=true
+    has_more: bool
 
 # --- Auth / Users ---
 class UserBase(BaseModel):
@@ -56,6 +64,8 @@ class UserInDB(UserBase):
 
 class UserInfo(BaseModel):
     """User information for admin listing"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     username: str
     is_admin: bool
@@ -63,10 +73,11 @@ class UserInfo(BaseModel):
 class PagedUsersResponse(BaseModel):
     """Paginated response for user listing"""
     items: list[UserInfo]
-    total: int
+    total: Optional[int] = None  # only with include_total=true
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None  # only with include_total=true
+    has_more: bool
 
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,12 @@
+# Generated by backend/scripts/gen_seed_hashes.py - do not edit by hand.
+from __future__ import annotations
+
+SEED_USERS = [
+    {"username": "admin", "hashed_password": "$argon2id$v=19$m=19456,t=2,p=1$5zynVGoN4ZyTMqZ0TknJuQ$/B4npcgAsdfj0yfuCa6UvU3R4btGU6BNgd+F6QFqdY0", "is_admin": True},
+    {"username": "user1", "hashed_password": "$argon2id$v=19$m=19456,t=2,p=1$2rv3HqP03ru3llLqXWstBQ$cXvhrgJb8kxT4VyFBXj4x4Ym74iqyh1vzHaZfpHKQbs", "is_admin": False},
+    {"username": "user2", "hashed_password": "$argon2id$v=19$m=19456,t=2,p=1$6R3jnPMeY8y59x5DSImxNg$HQ2JxLMLXXCNY5UbGRlqMauB3dccUxSl9z2t937WiiI", "is_admin": False},
+    {"username": "testuser", "hashed_password": "$argon2id$v=19$m=19456,t=2,p=1$TGkt5TzHGANgrFUKwRjjnA$vW6p7Zp3PGzDvNvOF3j1dv+wb/IOvYcbPeIqEEwS5vw", "is_admin": False},
+    {"username": "jankowalski", "hashed_password": "$argon2id$v=19$m=19456,t=2,p=1$eu+9l5IyJqR0bs25F6L0fg$YypGWLo9hIc9pFLuiuu8/mZkxERz5wbzOMut8CXYiwM", "is_admin": False},
+    {"username": "annanowak", "hashed_password": "$argon2id$v=19$m=19456,t=2,p=1$vbc2JqT0vneu1fpfC0FoLQ$9xjte5EIFwy/FrOjsKmuAWUPxqE8YzFD6bS8ieTUOek", "is_admin": False},
+    {"username": "testadmin", "hashed_password": "$argon2id$v=19$m=19456,t=2,p=1$4Jzzfs95791bi3HOee9d6w$S+C3bJEFv8BCKuyWaTThIz/nZ6nquGY93IFz4g2jOo0", "is_admin": True},
+]
@@ -0,0 +1 @@
+# Maintenance scripts package
@@ -0,0 +1,44 @@
+"""Regenerate `app/seed_hashes.py` with pre-hashed passwords for the seed users.
+
+Run from the main project directory:
+
+    python -m backend.scripts.gen_seed_hashes
+"""
+from __future__ import annotations
+import json
+from pathlib import Path
+
+from backend.app.auth import pwd_context
+
+# Plain-text credentials of the demo accounts (documented in README)
+SEED_CREDENTIALS = [
+    {"username": "admin", "password": "admin", "is_admin": True},
+    {"username": "user1", "password": "password1", "is_admin": False},
+    {"username": "user2", "password": "password2", "is_admin": False},
+    {"username": "testuser", "password": "test123", "is_admin": False},
+    {"username": "jankowalski", "password": "kowalski123", "is_admin": False},
+    {"username": "annanowak", "password": "nowak456", "is_admin": False},
+    {"username": "testadmin", "password": "admin123", "is_admin": True},
+]
+
+_OUTPUT_PATH = Path(__file__).resolve().parents[1] / "app" / "seed_hashes.py"
+
+
+def main() -> None:
+    lines = [
+        "# Generated by backend/scripts/gen_seed_hashes.py - do not edit by hand.",
+        "from __future__ import annotations",
+        "",
+        "SEED_USERS = [",
+    ]
+    for u in SEED_CREDENTIALS:
+        username = json.dumps(u["username"])
+        hashed_password = json.dumps(pwd_context.hash(u["password"]))
+        lines.append(f'    {{"username": {username}, "hashed_password": {hashed_password}, "is_admin": {u["is_admin"]}}},')
+    lines.append("]")
+    _OUTPUT_PATH.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"Wrote {len(SEED_CREDENTIALS)} seed users to {_OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
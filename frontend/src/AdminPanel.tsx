@@ -145,8 +145,8 @@ function ProductsManagement() {
       const [cats, list] = await Promise.all([getCategories(), getAdminGear(query)])
       setCategories(cats)
       setItems(list.items)
-      setTotal(list.total)
-      setPages(list.pages)
+      setTotal(list.total ?? 0)
+      setPages(list.pages ?? 1)
     } catch (e: any) {
       setError(String(e?.message || e))
     } finally {
@@ -404,8 +404,8 @@ function UsersManagement() {
     try {
       const list = await getAdminUsers(query)
       setUsers(list.items)
-      setTotal(list.total)
-      setPages(list.pages)
+      setTotal(list.total ?? 0)
+      setPages(list.pages ?? 1)
     } catch (e: any) {
       setError(String(e?.message || e))
     } finally {
@@ -57,10 +57,11 @@ export default function App() {
           sort,
           page,
           page_size: PAGE_SIZE,
+          include_total: true,
         })
         setItems(data.items)
-        setTotal(data.total)
-        setTotalPages(data.pages)
+        setTotal(data.total ?? 0)
+        setTotalPages(data.pages ?? 1)
       } catch (e: any) {
         setError(String(e?.message || e))
       } finally {
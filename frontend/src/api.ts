@@ -34,10 +34,11 @@ export interface UserInfo {
 
 export interface PagedUsersResponse {
   items: UserInfo[]
-  total: number
+  total: number | null  // null unless include_total was requested
   page: number
   page_size: number
-  pages: number
+  pages: number | null  // null unless include_total was requested
+  has_more: boolean
 }
 
 // --- Cart types ---
@@ -83,10 +84,11 @@ export async function getCategories(): Promise<Category[]> {
 // Paged API types
 export interface PagedResponse<T> {
   items: T[]
-  total: number
+  total: number | null  // null unless include_total was requested
   page: number
   page_size: number
-  pages: number
+  pages: number | null  // null unless include_total was requested
+  has_more: boolean
 }
 
 export type GearQuery = {
@@ -95,6 +97,7 @@ export type GearQuery = {
   sort?: 'relevance' | 'price_asc' | 'price_desc' | 'name_asc' | 'rating_desc' | 'in_stock'
   page?: number
   page_size?: number
+  include_total?: boolean
 }
 
 export type AdminGearQuery = {
@@ -119,17 +122,18 @@ export async function getGear(params: GearQuery = {}): Promise<PagedResponse<Gea
   if (params.sort) url.searchParams.set('sort', params.sort)
   if (params.page) url.searchParams.set('page', String(params.page))
   if (params.page_size) url.searchParams.set('page_size', String(params.page_size))
+  if (params.include_total) url.searchParams.set('include_total', 'true')
   const res = await fetch(url)
   if (!res.ok) throw new Error('Failed to load gear')
   const json = await res.json()
   // Backward compatibility: if backend returns a plain array, wrap it
   if (Array.isArray(json)) {
     const arr = json as GearItem[]
-    return { items: arr, total: arr.length, page: 1, page_size: arr.length, pages: 1 }
+    return { items: arr, total: arr.length, page: 1, page_size: arr.length, pages: 1, has_more: false }
   }
   // Fallback guard
   if (!json || !Array.isArray(json.items)) {
-    return { items: [], total: 0, page: 1, page_size: params.page_size ?? 0, pages: 1 }
+    return { items: [], total: 0, page: 1, page_size: params.page_size ?? 0, pages: 1, has_more: false }
   }
   return json as PagedResponse<GearItem>
 }
@@ -312,6 +316,7 @@ export async function getAdminGear(params: AdminGearQuery = {}): Promise<PagedRe
   if (params.sort) url.searchParams.set('sort', params.sort)
   if (params.page) url.searchParams.set('page', String(params.page))
   if (params.page_size) url.searchParams.set('page_size', String(params.page_size))
+  url.searchParams.set('include_total', 'true')
   
   const res = await fetch(url, {
     headers: { Authorization: `Bearer ${token}` }
@@ -330,6 +335,7 @@ export async function getAdminUsers(params: AdminUsersQuery = {}): Promise<Paged
   if (params.sort) url.searchParams.set('sort', params.sort)
   if (params.page) url.searchParams.set('page', String(params.page))
   if (params.page_size) url.searchParams.set('page_size', String(params.page_size))
+  url.searchParams.set('include_total', 'true')
   
   const res = await fetch(url, {
     headers: { Authorization: `Bearer ${token}` }